@@ -1,27 +1,41 @@
 import argparse
+import contextlib
 import csv
 import fnmatch
+import functools
+import io
+import itertools
+import os
+import re
 import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, cast
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Tuple, cast
 
 import yaml
 
-from .constants import OUTPUT_HEADERS
-from .mapping_engine import MappingConfigurationError, apply_row_mapping
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader
+
+from .constants import IO_BUFFER_SIZE, OUTPUT_HEADERS
+from .mapping_engine import MappingConfigurationError, compile_row_mapper
 from .mappers.coinbase import load_coinbase_rows
 from .mappers.firi import map_firi_transactions
 from .mappers.nbx import load_nbx_rows
 from .mappers.kraken import map_kraken_ledger
+from .utils import advise_sequential_read
 
 
 def load_config(config_path: Path) -> Dict[str, Any]:
     """Load and parse YAML configuration file."""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config or {}
+            config = yaml.load(f, Loader=SafeLoader) or {}
+        return config
     except FileNotFoundError:
         print(f"Error: Configuration file not found: {config_path}", file=sys.stderr)
         sys.exit(1)
@@ -35,46 +49,91 @@ def get_csv_files(input_dir: Path) -> List[Path]:
     if not input_dir.exists():
         print(f"Error: Input directory does not exist: {input_dir}", file=sys.stderr)
         sys.exit(1)
-    return [p for p in input_dir.rglob("*.csv") if p.is_file()]
+    return list(_walk_csv_files(input_dir))
 
 
-def _sniff_dialect(sample: str):  # returns a dialect instance
-    try:
-        return csv.Sniffer().sniff(sample)
-    except csv.Error:
-        # Return an instance of the excel dialect (the class exposes dialect config)
-        return csv.excel()
-
-
-def read_csv_rows(file_path: Path) -> List[Dict[str, str]]:
-    """Default CSV loader that normalises headers and trims values."""
-    with file_path.open("r", encoding="utf-8", newline="") as fh:
-        sample = fh.read(4096)
-        fh.seek(0)
-        dialect = _sniff_dialect(sample)
-        reader = csv.DictReader(fh, dialect=dialect)
-        # Normalize headers
-        if reader.fieldnames:
-            reader.fieldnames = [h.strip() for h in reader.fieldnames]
-        rows: List[Dict[str, str]] = []
-        for entry in reader:
-            normalised = {
-                (key or "").strip(): (value or "").strip()
-                for key, value in entry.items()
-            }
-            rows.append(normalised)
-        return rows
+def _walk_csv_files(root: Path) -> Iterator[Path]:
+    # scandir exposes the entry type from readdir, avoiding a stat per file
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except PermissionError:
+            # Unreadable directories are skipped, as Path.rglob does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".csv") and entry.is_file():
+                    yield Path(entry.path)
+
+
+csv.register_dialect("semicolon", delimiter=";")
+
+# Known exports have fixed dialects, so there is no need to sniff each file
+DIALECT_BY_SOURCE: Dict[str, str] = {
+    "coinbase": "excel",
+    "firi": "excel",
+    "kraken": "excel",
+    "nbx": "semicolon",
+}
 
 
-def write_mapped_file(rows: List[Dict[str, Any]], output_path: Path) -> None:
-    if not rows:
+def iter_csv_rows(file_path: Path, dialect: str = "excel") -> Iterator[Dict[str, str]]:
+    """Default CSV loader that normalises headers and trims values.
+
+    Rows are yielded as they are read so large exports stream through the
+    mapping pipeline instead of being held in memory.
+    """
+    with file_path.open(
+        "r", encoding="utf-8", newline="", buffering=IO_BUFFER_SIZE
+    ) as fh:
+        advise_sequential_read(fh)
+        reader = csv.reader(fh, dialect=dialect)
+        header = next(reader, None)
+        if not header:
+            return
+        # Normalize headers once; every row dict shares these key objects
+        headers = [h.strip() for h in header]
+        width = len(headers)
+        for values in reader:
+            if not values:
+                continue
+            if len(values) < width:
+                values += [""] * (width - len(values))
+            yield dict(zip(headers, [value.strip() for value in values]))
+
+
+def write_mapped_file(rows: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """Write mapped rows to ``output_path`` and return the number written."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
         print(f"Warning: No mapped rows to write for {output_path.name}")
-        return
-    with output_path.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=OUTPUT_HEADERS, extrasaction="ignore")
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({key: r.get(key, "") for key in OUTPUT_HEADERS})
+        return 0
+    # zip() pulls a row before advancing the counter, so the counter ends up
+    # at the number of rows written
+    counter = itertools.count()
+    # Rows are mapped while writing, so write beside the target and only
+    # replace it once every row succeeded; a failure keeps the old output
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open(
+            "w", encoding="utf-8", newline="", buffering=IO_BUFFER_SIZE
+        ) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(OUTPUT_HEADERS)
+            writer.writerows(
+                [r.get(key, "") for key in OUTPUT_HEADERS]
+                for r, _ in zip(itertools.chain([first], rows), counter)
+            )
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return next(counter)
 
 
 ROW_LOADER_REGISTRY: Dict[str, Any] = {
@@ -89,90 +148,141 @@ FILE_HANDLER_REGISTRY: Dict[str, Any] = {
 }
 
 
+# Keyed by the glob strings rather than the config entry, so user config dicts
+# are left untouched and the cache stays bounded.
+@functools.lru_cache(maxsize=256)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Tuple[Pattern[str], ...]:
+    return tuple(re.compile(fnmatch.translate(pattern)) for pattern in patterns)
+
+
 def _match_file_pattern(file_cfg: Dict[str, Any], file_path: Path) -> bool:
-    patterns: List[str] = []
+    globs: List[str] = []
     if "pattern" in file_cfg:
-        patterns.append(file_cfg["pattern"])
-    patterns.extend(file_cfg.get("patterns", []))
+        globs.append(file_cfg["pattern"])
+    globs.extend(file_cfg.get("patterns", []))
+    patterns = _compile_patterns(tuple(globs))
     if not patterns:
         return True
     file_name = file_path.name
-    return any(fnmatch.fnmatch(file_name, pattern) for pattern in patterns)
+    return any(pattern.match(file_name) for pattern in patterns)
+
+
+@dataclass(slots=True)
+class CompiledFileConfig:
+    """A matched file config entry with its settings resolved once per file."""
+
+    raw: Dict[str, Any]
+    mode: str
+    expected_columns: Tuple[str, ...]
+    require_rows: bool
+    loader: Optional[str]
+    handler: Optional[str]
+    dialect: Optional[str]
+    ignore_set: FrozenSet[str]
+    id_prefix: Optional[str]
+    id_padding: int
+
+    @classmethod
+    def from_config(cls, file_cfg: Dict[str, Any]) -> "CompiledFileConfig":
+        ignore = cast(List[str], file_cfg.get("ignore_transaction_types") or [])
+        return cls(
+            raw=file_cfg,
+            mode=(file_cfg.get("mode") or "row").lower(),
+            expected_columns=tuple(file_cfg.get("expected_columns") or ()),
+            require_rows=bool(file_cfg.get("require_rows")),
+            loader=file_cfg.get("loader"),
+            handler=file_cfg.get("handler"),
+            dialect=file_cfg.get("dialect"),
+            ignore_set=frozenset(str(value).upper() for value in ignore),
+            id_prefix=file_cfg.get("id_sequence_prefix"),
+            id_padding=int(file_cfg.get("id_sequence_padding", 6)),
+        )
 
 
 def _resolve_file_config(
     config: Dict[str, Any], source: str, file_path: Path
-) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    sources_config = config.get("sources", {})
-    source_config = sources_config.get(source, {})
-    for file_cfg in source_config.get("files", []):
+) -> Tuple[Optional[CompiledFileConfig], Dict[str, Any]]:
+    sources_config = config.get("sources") or {}
+    source_config = sources_config.get(source) or {}
+    for file_cfg in source_config.get("files") or []:
         if _match_file_pattern(file_cfg, file_path):
-            return file_cfg, source_config
-    return {}, source_config
+            if not file_cfg:
+                break
+            return CompiledFileConfig.from_config(file_cfg), source_config
+    return None, source_config
 
 
 def _validate_expected_columns(
-    rows: List[Dict[str, str]], file_cfg: Dict[str, Any], file_path: Path
-) -> None:
-    expected = cast(List[str], file_cfg.get("expected_columns") or [])
+    rows: Iterable[Dict[str, str]], file_cfg: CompiledFileConfig, file_path: Path
+) -> Iterator[Dict[str, str]]:
+    """Check the first row against ``expected_columns``.
+
+    Returns an iterator over all rows, including the one peeked at.
+    """
+    rows = iter(rows)
+    expected = file_cfg.expected_columns
     if not expected:
-        return
-    if not rows:
-        if file_cfg.get("require_rows"):
+        return rows
+    first = next(rows, None)
+    if first is None:
+        if file_cfg.require_rows:
             raise ValueError(f"{file_path.name}: no rows found but columns were expected")
         print(
             f"Warning: {file_path.name} contained no data rows; skipping column validation"
         )
-        return
-    available = {key.strip() for key in rows[0].keys() if key}
+        return rows
+    available = {key.strip() for key in first.keys() if key}
     missing = [column for column in expected if column not in available]
     if missing:
         raise ValueError(
             f"{file_path.name}: missing required columns: {', '.join(missing)}"
         )
+    return itertools.chain([first], rows)
 
 
 def _load_rows_for_file(
-    file_path: Path, file_cfg: Dict[str, Any]
-) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
-    loader_key = file_cfg.get("loader")
+    file_path: Path, file_cfg: CompiledFileConfig
+) -> Tuple[Iterable[Dict[str, str]], Dict[str, Any]]:
+    loader_key = file_cfg.loader
     if loader_key:
         loader = ROW_LOADER_REGISTRY.get(loader_key)
         if not loader:
             raise ValueError(f"Unknown loader '{loader_key}' for {file_path.name}")
         result = loader(file_path)
         if isinstance(result, tuple):
-            rows = cast(List[Dict[str, str]], result[0])
+            rows = cast(Iterable[Dict[str, str]], result[0])
             extra_context = cast(Dict[str, Any], result[1] or {})
         else:  # pragma: no cover - legacy fallback
-            rows = cast(List[Dict[str, str]], result)
+            rows = cast(Iterable[Dict[str, str]], result)
             extra_context = {}
         return rows, extra_context
-    return read_csv_rows(file_path), {}
+    source = file_path.parent.name.lower()
+    dialect = file_cfg.dialect or DIALECT_BY_SOURCE.get(source, "excel")
+    return iter_csv_rows(file_path, dialect), {}
 
 
 def _process_with_row_mapping(
-    rows: List[Dict[str, str]],
+    rows: Iterable[Dict[str, str]],
     file_cfg: Dict[str, Any],
     context: Dict[str, Any],
-) -> List[Dict[str, Any]]:
-    mapped: List[Dict[str, Any]] = []
+) -> Iterator[Dict[str, Any]]:
+    mapper = compile_row_mapper(file_cfg)
+    # The mapper does not retain the context, so one copy is reused
+    row_context = dict(context)
     for idx, row in enumerate(rows, start=1):
-        row_context = dict(context)
         row_context["row_index"] = idx
-        converted = apply_row_mapping(row, file_cfg, row_context)
+        converted = mapper(row, row_context)
         if converted:
-            mapped.append(converted)
-    return mapped
+            yield converted
 
 
 def _process_with_file_handler(
     file_path: Path,
     rows: List[Dict[str, str]],
-    file_cfg: Dict[str, Any],
+    file_cfg: CompiledFileConfig,
     context: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
-    handler_key = file_cfg.get("handler")
+    handler_key = file_cfg.handler
     if not handler_key:
         raise ValueError(
             f"File-level mapping for {file_path.name} requires a handler property"
@@ -184,40 +294,38 @@ def _process_with_file_handler(
 
 
 def _filter_transaction_types(
-    rows: List[Dict[str, Any]], file_cfg: Dict[str, Any]
-) -> List[Dict[str, Any]]:
-    ignore = cast(List[str], file_cfg.get("ignore_transaction_types") or [])
-    if not ignore:
-        return rows
-    ignore_set = {str(value).upper() for value in ignore}
-    filtered: List[Dict[str, Any]] = []
+    rows: Iterable[Dict[str, Any]], file_cfg: CompiledFileConfig
+) -> Iterator[Dict[str, Any]]:
+    ignore_set = file_cfg.ignore_set
+    if not ignore_set:
+        yield from rows
+        return
     skipped = 0
     for row in rows:
         tx_type = (row.get("TransactionType") or "").upper()
         if tx_type in ignore_set:
             skipped += 1
             continue
-        filtered.append(row)
+        yield row
     if skipped:
         print(
             f"Filtered {skipped} row(s) by TransactionType: {', '.join(sorted(ignore_set))}"
         )
-    return filtered
 
 
 def _apply_id_sequence(
-    rows: List[Dict[str, Any]], file_cfg: Dict[str, Any]
-) -> List[Dict[str, Any]]:
-    prefix = file_cfg.get("id_sequence_prefix")
+    rows: Iterable[Dict[str, Any]], file_cfg: CompiledFileConfig
+) -> Iterator[Dict[str, Any]]:
+    prefix = file_cfg.id_prefix
     if not prefix:
-        return rows
-    padding = int(file_cfg.get("id_sequence_padding", 6))
+        yield from rows
+        return
+    padding = file_cfg.id_padding
+    # Resolve prefix and padding into one template instead of per row
+    template = str(prefix).replace("%", "%%") + (f"-%0{padding}d" if padding > 0 else "-%d")
     for idx, row in enumerate(rows, start=1):
-        if padding > 0:
-            row["Id"] = f"{prefix}-{idx:0{padding}d}"
-        else:
-            row["Id"] = f"{prefix}-{idx}"
-    return rows
+        row["Id"] = template % idx
+        yield row
 
 
 def process_file(
@@ -233,10 +341,10 @@ def process_file(
         )
         return 0
 
-    mode = (file_cfg.get("mode") or "row").lower()
+    mode = file_cfg.mode
 
     if mode == "skip":
-        reason = file_cfg.get("reason", "skipped via configuration")
+        reason = file_cfg.raw.get("reason", "skipped via configuration")
         print(f"Skipping {input_file.name}: {reason}")
         return 0
 
@@ -244,33 +352,110 @@ def process_file(
         "config": config,
         "source": source,
         "source_config": source_cfg,
-        "file_config": file_cfg,
+        "file_config": file_cfg.raw,
     }
 
     rows, extra_context = _load_rows_for_file(input_file, file_cfg)
     if extra_context:
         context.update(extra_context)
 
-    _validate_expected_columns(rows, file_cfg, input_file)
+    rows = _validate_expected_columns(rows, file_cfg, input_file)
 
+    mapped_rows: Iterable[Dict[str, Any]]
     if mode == "row":
-        mapped_rows = _process_with_row_mapping(rows, file_cfg, context)
+        mapped_rows = _process_with_row_mapping(rows, file_cfg.raw, context)
     elif mode == "file":
-        mapped_rows = _process_with_file_handler(input_file, rows, file_cfg, context)
+        mapped_rows = _process_with_file_handler(input_file, list(rows), file_cfg, context)
     else:
         raise ValueError(f"Unsupported mapping mode '{mode}' for {input_file.name}")
 
     mapped_rows = _filter_transaction_types(mapped_rows, file_cfg)
     mapped_rows = _apply_id_sequence(mapped_rows, file_cfg)
 
-    out_name = f"{input_file.stem}_mapped.csv"
+    out_name = _output_name(input_file)
     output_path = output_dir / out_name
     if dry_run:
-        print(f"[dry-run] {input_file.name}: {len(mapped_rows)} mapped rows")
+        row_count = sum(1 for _ in mapped_rows)
+        print(f"[dry-run] {input_file.name}: {row_count} mapped rows")
     else:
-        write_mapped_file(mapped_rows, output_path)
-        print(f"Processed {input_file.name} -> {out_name} ({len(mapped_rows)} rows)")
-    return len(mapped_rows)
+        row_count = write_mapped_file(mapped_rows, output_path)
+        print(f"Processed {input_file.name} -> {out_name} ({row_count} rows)")
+    return row_count
+
+
+def _output_name(input_file: Path) -> str:
+    return f"{input_file.stem}_mapped.csv"
+
+
+def _find_output_collisions(
+    csv_files: List[Path], config: Dict[str, Any]
+) -> Dict[str, List[Path]]:
+    """Group inputs that would write the same output file.
+
+    Files that are skipped or have no mapping config never write, so they are
+    left out. With parallel workers the last writer would depend on timing.
+    """
+    writers: Dict[str, List[Path]] = {}
+    for input_file in csv_files:
+        source = input_file.parent.name.lower()
+        file_cfg, _ = _resolve_file_config(config, source, input_file)
+        if file_cfg is None or file_cfg.mode == "skip":
+            continue
+        writers.setdefault(_output_name(input_file), []).append(input_file)
+    return {name: paths for name, paths in writers.items() if len(paths) > 1}
+
+
+@dataclass
+class FileResult:
+    input_file: Path
+    row_count: int
+    stdout: str
+    stderr: str
+
+
+def _process_file_worker(
+    input_file: Path,
+    output_dir: Path,
+    config: Dict[str, Any],
+    dry_run: bool,
+    verbose: bool,
+) -> FileResult:
+    """Run ``process_file`` in a pool worker, capturing its console output."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    row_count = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            row_count = process_file(input_file, output_dir, config, dry_run=dry_run)
+        except MappingConfigurationError as err:
+            print(f"Mapping error in {input_file.name}: {err}", file=sys.stderr)
+            if verbose or config.get("verbose_errors"):
+                traceback.print_exc()
+        except Exception as e:
+            print(f"Error converting {input_file.name}: {e}", file=sys.stderr)
+            if verbose:
+                traceback.print_exc()
+    return FileResult(input_file, row_count, stdout.getvalue(), stderr.getvalue())
+
+
+# Set once per pool worker so the config is not pickled with every task
+_WORKER_CONFIG: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+
+def _run_in_worker(
+    input_file: Path, output_dir: Path, dry_run: bool, verbose: bool
+) -> FileResult:
+    return _process_file_worker(input_file, output_dir, _WORKER_CONFIG, dry_run, verbose)
+
+
+def _report(result: FileResult) -> None:
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
 
 
 def main():
@@ -310,8 +495,16 @@ def main():
         action='store_true',
         help='Parse and convert but do not write output files'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of files to convert in parallel (default: CPU count)'
+    )
     
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
     
     # Load configuration
     config = load_config(args.config)
@@ -333,18 +526,38 @@ def main():
     
     print(f"Found {len(csv_files)} CSV file(s) to process")
     
-    # Process each CSV file
-    for input_file in csv_files:
-        try:
-            process_file(input_file, args.output, config, dry_run=args.dry_run)
-        except MappingConfigurationError as err:
-            print(f"Mapping error in {input_file.name}: {err}", file=sys.stderr)
-            if args.verbose or config.get("verbose_errors"):
-                traceback.print_exc()
-        except Exception as e:
-            print(f"Error converting {input_file.name}: {e}", file=sys.stderr)
-            if args.verbose:
-                traceback.print_exc()
+    if not args.dry_run:
+        collisions = _find_output_collisions(csv_files, config)
+        if collisions:
+            for out_name, paths in sorted(collisions.items()):
+                joined = ", ".join(str(path) for path in paths)
+                print(f"Error: {joined} would write the same output {out_name}", file=sys.stderr)
+            sys.exit(1)
+
+    # Largest files first so a big ledger doesn't start last and hold up the run
+    csv_files.sort(key=lambda path: path.stat().st_size, reverse=True)
+    jobs = min(args.jobs or os.cpu_count() or 1, len(csv_files))
+
+    if jobs == 1:
+        for input_file in csv_files:
+            _report(
+                _process_file_worker(
+                    input_file, args.output, config, args.dry_run, args.verbose
+                )
+            )
+    else:
+        # Files are independent, so map them in parallel and report from the parent
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(config,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_in_worker, input_file, args.output, args.dry_run, args.verbose
+                )
+                for input_file in csv_files
+            ]
+            for future in as_completed(futures):
+                _report(future.result())
     
     print("Conversion complete")
 
@@ -1,4 +1,4 @@
-OUTPUT_HEADERS = [
+OUTPUT_HEADERS = (
     "Id",
     "ExchangeId",
     "timeStamp",
@@ -12,7 +12,7 @@ OUTPUT_HEADERS = [
     "FilledPrice",
     "Fee",
     "FeeCurrency",
-]
+)
 
 FIAT_CURRENCIES = {
     "NOK",
@@ -23,3 +23,6 @@ FIAT_CURRENCIES = {
     "DKK",
     "CHF",
 }
+
+# Buffer size for CSV input/output streams; large buffers cut syscalls on big exports
+IO_BUFFER_SIZE = 1 << 20
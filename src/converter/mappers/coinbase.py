@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import csv
+import itertools
+import sys
 from decimal import Decimal
-from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+from ..constants import IO_BUFFER_SIZE
+from ..utils import ZERO, advise_sequential_read, normalize_upper
 
 
 TRANSACTION_TYPE_MAP = {
@@ -17,48 +21,75 @@ TRANSACTION_TYPE_MAP = {
     "withdrawal": "WITHDRAWAL",
 }
 
+# Exact transaction types resolved without the substring scan below
+_TYPE_TO_SIDE = {
+    "withdrawal": "WITHDRAW",
+    "deposit": "DEPOSIT",
+    "sell": "SELL",
+    "buy": "BUY",
+    "advanced trade sell": "SELL",
+    "advanced trade buy": "BUY",
+}
+
+
+def load_coinbase_rows(file_path: Path) -> Tuple[Iterator[Dict[str, str]], Dict[str, Any]]:
+    """Read a Coinbase export, extracting the account id metadata row.
 
-def load_coinbase_rows(file_path: Path) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
-    """Read a Coinbase export, extracting the account id metadata row."""
+    The preamble is scanned eagerly for the account id; data rows are then
+    streamed from the same handle, which is closed once they are exhausted.
+    """
 
-    content = file_path.read_text(encoding="utf-8")
-    lines = content.splitlines()
     account_id: Optional[str] = None
-    header_index: Optional[int] = None
-
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("User,"):
-            parts = [part.strip() for part in stripped.split(",")]
-            if len(parts) >= 3 and parts[2]:
-                account_id = parts[2]
-        if stripped.startswith("ID,"):
-            header_index = idx
-            break
-
-    if header_index is None:
-        return [], {"account_id": account_id}
-
-    data = "\n".join(lines[header_index:])
-    reader = csv.DictReader(StringIO(data))
-    rows: List[Dict[str, str]] = []
-    for row in reader:
-        identifier = (row.get("ID") or "").strip()
-        if not identifier:
-            continue
-        normalized = {
-            (key or "").strip(): (value or "").strip()
-            for key, value in row.items()
-        }
-        rows.append(normalized)
-
-    return rows, {"account_id": account_id}
+    header_line: Optional[str] = None
+
+    fh = file_path.open("r", encoding="utf-8", newline="", buffering=IO_BUFFER_SIZE)
+    try:
+        advise_sequential_read(fh)
+        for line in fh:
+            stripped = line.strip()
+            if stripped.startswith("User,"):
+                parts = [part.strip() for part in stripped.split(",")]
+                if len(parts) >= 3 and parts[2]:
+                    account_id = parts[2]
+            if stripped.startswith("ID,"):
+                header_line = line
+                break
+    except BaseException:
+        fh.close()
+        raise
+
+    if header_line is None:
+        fh.close()
+        return iter(()), {"account_id": account_id}
+
+    return _iter_coinbase_rows(fh, header_line), {"account_id": account_id}
+
+
+def _iter_coinbase_rows(fh: IO[str], header_line: str) -> Iterator[Dict[str, str]]:
+    with fh:
+        # The handle is positioned just past the header, so keep reading from it
+        reader = csv.reader(itertools.chain([header_line], fh))
+        headers = [h.strip() for h in next(reader)]
+        width = len(headers)
+        id_index = headers.index("ID")
+        for values in reader:
+            # Strip each cell once; the ID check reads the cleaned value
+            cleaned = [value.strip() for value in values]
+            if len(cleaned) <= id_index or not cleaned[id_index]:
+                continue
+            if len(cleaned) < width:
+                cleaned += [""] * (width - len(cleaned))
+            yield dict(zip(headers, cleaned))
 
 
 def coinbase_determine_side(
     transaction_type: Optional[str], quantity: Optional[Decimal]
 ) -> str:
-    tx_type = (transaction_type or "").lower()
+    # Cheap when the config already passes a stripped, lower-cased value
+    tx_type = (transaction_type or "").strip().lower()
+    side = _TYPE_TO_SIDE.get(tx_type)
+    if side is not None:
+        return side
     if "withdraw" in tx_type:
         return "WITHDRAW"
     if "deposit" in tx_type:
@@ -67,7 +98,7 @@ def coinbase_determine_side(
         return "SELL"
     if "buy" in tx_type:
         return "BUY"
-    if quantity is not None and quantity < 0:
+    if quantity is not None and quantity < ZERO:
         return "SELL"
     return "BUY"
 
@@ -76,7 +107,11 @@ def coinbase_transaction_type(transaction_type: Optional[str]) -> str:
     tx_type = (transaction_type or "").strip().lower()
     if not tx_type:
         return "UNKNOWN"
-    return TRANSACTION_TYPE_MAP.get(tx_type, tx_type.upper())
+    mapped = TRANSACTION_TYPE_MAP.get(tx_type)
+    if mapped is None:
+        # Unmapped types repeat across rows; share one string per value
+        mapped = sys.intern(tx_type.upper())
+    return mapped
 
 
 def coinbase_compute_price(
@@ -84,10 +119,9 @@ def coinbase_compute_price(
 ) -> Optional[Decimal]:
     if total_value is None or quantity is None:
         return None
-    quantity_abs = abs(quantity)
-    if not quantity_abs:
+    if not quantity:
         return None
-    return abs(total_value) / quantity_abs
+    return abs(total_value) / abs(quantity)
 
 
 def coinbase_fee_currency(
@@ -95,4 +129,4 @@ def coinbase_fee_currency(
 ) -> str:
     if fee_amount is None or not fee_amount:
         return ""
-    return (price_currency or "").strip().upper()
+    return sys.intern(normalize_upper(price_currency))
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple
 
-from ..constants import OUTPUT_HEADERS
 from ..utils import (
+    ZERO,
     abs_decimal_to_str,
     decimal_to_str,
     format_market,
     is_fiat,
+    normalize_lower,
+    normalize_upper,
     parse_decimal,
     parse_firi_timestamp,
     split_market,
@@ -21,18 +26,26 @@ MATCH_FEE_ACTION = "MatchFee"
 STAKING_REWARD_ACTION = "StakingReward"
 BANK_DEPOSIT_ACTION = "BankDeposit"
 BANK_WITHDRAW_ACTION = "BankWithdrawal"
-INTERNAL_ACTIONS = {"InternalTransfer", "Stake"}
+INTERNAL_ACTIONS = frozenset({"InternalTransfer", "Stake"})
+_MATCH_ACTIONS = frozenset({MATCH_ACTION, MATCH_FEE_ACTION})
 
 
-def _sum_amounts(rows: Iterable[Dict[str, str]]) -> Dict[str, Decimal]:
-    totals: Dict[str, Decimal] = {}
-    for row in rows:
-        amount = parse_decimal(row.get("Amount")) or Decimal("0")
-        currency = (row.get("Currency") or "").upper()
-        if not currency:
-            continue
-        totals[currency] = totals.get(currency, Decimal("0")) + amount
-    return totals
+@dataclass
+class _MatchGroup:
+    """Rows of one match with per-currency totals accumulated as they arrive."""
+
+    rows: List[Dict[str, str]] = field(default_factory=list)
+    match_totals: Dict[str, Decimal] = field(default_factory=dict)
+    fee_totals: Dict[str, Decimal] = field(default_factory=dict)
+    has_fees: bool = False
+
+
+def _add_amount(totals: Dict[str, Decimal], row: Dict[str, str]) -> None:
+    currency = normalize_upper(row.get("Currency"))
+    if not currency:
+        return
+    amount = parse_decimal(row.get("Amount")) or ZERO
+    totals[currency] = totals.get(currency, ZERO) + amount
 
 
 def _select_currency(totals: Dict[str, Decimal], prefer_fiat: bool) -> Tuple[str, Decimal]:
@@ -47,29 +60,65 @@ def _select_currency(totals: Dict[str, Decimal], prefer_fiat: bool) -> Tuple[str
     if totals:
         currency, amount = max(totals.items(), key=lambda item: abs(item[1]))
         return currency, amount
-    return "", Decimal("0")
+    return "", ZERO
+
 
+def _select_base_and_quote(
+    totals: Dict[str, Decimal]
+) -> Tuple[Tuple[str, Decimal], Tuple[str, Decimal]]:
+    """Pick the largest non-fiat (base) and fiat (quote) totals in one pass.
 
-def _group_matches(rows: Iterable[Dict[str, str]]) -> DefaultDict[str, List[Dict[str, str]]]:
-    grouped: DefaultDict[str, List[Dict[str, str]]] = defaultdict(list)
+    Falls back to the overall largest total when one side is missing, as
+    ``_select_currency`` does.
+    """
+    best: Dict[bool, Tuple[str, Decimal, Decimal]] = {}
+    overall: Optional[Tuple[str, Decimal, Decimal]] = None
+    for currency, amount in totals.items():
+        magnitude = abs(amount)
+        fiat = is_fiat(currency)
+        current = best.get(fiat)
+        if current is None or magnitude > current[2]:
+            best[fiat] = (currency, amount, magnitude)
+        if overall is None or magnitude > overall[2]:
+            overall = (currency, amount, magnitude)
+    if overall is None:
+        return ("", ZERO), ("", ZERO)
+    base = best.get(False, overall)
+    quote = best.get(True, overall)
+    return (base[0], base[1]), (quote[0], quote[1])
+
+
+def _classify_rows(
+    rows: List[Dict[str, str]]
+) -> Tuple[DefaultDict[str, _MatchGroup], List[Tuple[Dict[str, str], str]]]:
+    """Split rows into match groups and other actions in a single pass."""
+    matches: DefaultDict[str, _MatchGroup] = defaultdict(_MatchGroup)
+    others: List[Tuple[Dict[str, str], str]] = []
+    # Exports use one spelling throughout, so resolve the column once
+    match_key = "Match ID" if rows and "Match ID" in rows[0] else "MatchId"
     for row in rows:
-        action = (row.get("Action") or "").strip()
-        if action not in {MATCH_ACTION, MATCH_FEE_ACTION}:
+        get = row.get
+        action = (get("Action") or "").strip()
+        if action not in _MATCH_ACTIONS:
+            others.append((row, action))
             continue
-        match_id = (row.get("Match ID") or row.get("MatchId") or "").strip()
+        match_id = (get(match_key) or "").strip()
         if not match_id:
             continue
-        grouped[match_id].append(row)
-    return grouped
-
+        group = matches[match_id]
+        group.rows.append(row)
+        if action == MATCH_ACTION:
+            _add_amount(group.match_totals, row)
+        else:
+            group.has_fees = True
+            _add_amount(group.fee_totals, row)
+    return matches, others
 
-def _map_match(match_id: str, rows: List[Dict[str, str]]) -> Dict[str, str]:
-    match_rows = [row for row in rows if (row.get("Action") or "").strip() == MATCH_ACTION]
-    fee_rows = [row for row in rows if (row.get("Action") or "").strip() == MATCH_FEE_ACTION]
 
-    match_totals = _sum_amounts(match_rows)
-    base_currency, base_amount = _select_currency(match_totals, prefer_fiat=False)
-    quote_currency, quote_amount = _select_currency(match_totals, prefer_fiat=True)
+def _map_match(match_id: str, group: _MatchGroup) -> Dict[str, str]:
+    (base_currency, base_amount), (quote_currency, quote_amount) = _select_base_and_quote(
+        group.match_totals
+    )
 
     side = "BUY" if base_amount >= 0 else "SELL"
     filled_quantity = abs(base_amount)
@@ -79,16 +128,14 @@ def _map_match(match_id: str, rows: List[Dict[str, str]]) -> Dict[str, str]:
     if filled_quantity and filled_quote:
         price = filled_quote / filled_quantity
 
-    fee_total = Decimal("0")
+    fee_total = ZERO
     fee_currency = ""
-    if fee_rows:
-        fee_totals = _sum_amounts(fee_rows)
-        fee_currency, fee_total = _select_currency(fee_totals, prefer_fiat=True)
+    if group.has_fees:
+        fee_currency, fee_total = _select_currency(group.fee_totals, prefer_fiat=True)
         fee_total = abs(fee_total)
 
-    timestamps = [parse_firi_timestamp(row.get("Created at", "")) for row in rows]
-    timestamp_candidates = [ts for ts in timestamps if ts]
-    timestamp = min(timestamp_candidates) if timestamp_candidates else ""
+    timestamps = (parse_firi_timestamp(row.get("Created at", "")) for row in group.rows)
+    timestamp = min((ts for ts in timestamps if ts), default="")
 
     market = format_market(base_currency, quote_currency)
 
@@ -110,8 +157,8 @@ def _map_match(match_id: str, rows: List[Dict[str, str]]) -> Dict[str, str]:
 
 
 def _map_staking_reward(row: Dict[str, str]) -> Dict[str, str]:
-    currency = (row.get("Currency") or "").upper()
-    amount = parse_decimal(row.get("Amount")) or Decimal("0")
+    currency = normalize_upper(row.get("Currency"))
+    amount = parse_decimal(row.get("Amount")) or ZERO
     timestamp = parse_firi_timestamp(row.get("Created at", ""))
     return {
         "Id": f"firi-staking-{row.get('Transaction ID', '')}",
@@ -131,8 +178,8 @@ def _map_staking_reward(row: Dict[str, str]) -> Dict[str, str]:
 
 
 def _map_bank_entry(row: Dict[str, str], transaction_type: str, side: str) -> Dict[str, str]:
-    currency = (row.get("Currency") or "").upper()
-    amount = parse_decimal(row.get("Amount")) or Decimal("0")
+    currency = normalize_upper(row.get("Currency"))
+    amount = parse_decimal(row.get("Amount")) or ZERO
     timestamp = parse_firi_timestamp(row.get("Created at", ""))
     return {
         "Id": f"firi-{side.lower()}-{row.get('Transaction ID', '')}",
@@ -151,42 +198,46 @@ def _map_bank_entry(row: Dict[str, str], transaction_type: str, side: str) -> Di
     }
 
 
+# Actions without a handler (INTERNAL_ACTIONS and unknown ones) are dropped
+_ACTION_HANDLERS: Dict[str, Callable[[Dict[str, str]], Dict[str, str]]] = {
+    STAKING_REWARD_ACTION: _map_staking_reward,
+    BANK_DEPOSIT_ACTION: partial(_map_bank_entry, transaction_type="DEPOSIT", side="DEPOSIT"),
+    BANK_WITHDRAW_ACTION: partial(_map_bank_entry, transaction_type="WITHDRAWAL", side="WITHDRAW"),
+}
+
+
 def _map_transactions(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    grouped = _group_matches(rows)
+    matches, others = _classify_rows(rows)
     mapped: List[Dict[str, str]] = []
 
-    for match_id, match_rows in grouped.items():
-        mapped.append(_map_match(match_id, match_rows))
+    for match_id, group in matches.items():
+        mapped.append(_map_match(match_id, group))
 
-    for row in rows:
-        action = (row.get("Action") or "").strip()
-        if action in {MATCH_ACTION, MATCH_FEE_ACTION}:
-            continue
-        if action in INTERNAL_ACTIONS:
-            continue
-        if action == STAKING_REWARD_ACTION:
-            mapped.append(_map_staking_reward(row))
-        elif action == BANK_DEPOSIT_ACTION:
-            mapped.append(_map_bank_entry(row, "DEPOSIT", "DEPOSIT"))
-        elif action == BANK_WITHDRAW_ACTION:
-            mapped.append(_map_bank_entry(row, "WITHDRAWAL", "WITHDRAW"))
-
-    mapped.sort(key=lambda item: item.get("timeStamp", ""))
+    for row, action in others:
+        handler = _ACTION_HANDLERS.get(action)
+        if handler is not None:
+            mapped.append(handler(row))
+
+    mapped.sort(key=itemgetter("timeStamp"))
     return mapped
 
 
 def _map_trades(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
     mapped: List[Dict[str, str]] = []
+    # Bind hot helpers to locals once for the per-row loop
+    parse = parse_decimal
+    trade_key = "Trade" if rows and "Trade" in rows[0] else "trade"
     for row in rows:
-        trade_id = row.get("Trade") or row.get("trade")
+        get = row.get
+        trade_id = get(trade_key)
         if not trade_id:
             continue
-        market_symbol = (row.get("Market") or "").upper()
+        market_symbol = normalize_upper(get("Market"))
         base, quote = split_market(market_symbol)
-        price = parse_decimal(row.get("Price"))
-        volume = parse_decimal(row.get("Volume"))
-        cost = parse_decimal(row.get("Cost"))
-        volume_currency = (row.get("Volume currency") or "").upper()
+        price = parse(get("Price"))
+        volume = parse(get("Volume"))
+        cost = parse(get("Cost"))
+        volume_currency = normalize_upper(get("Volume currency"))
 
         base_amount: Optional[Decimal] = None
         if volume is not None and volume_currency and base:
@@ -196,12 +247,12 @@ def _map_trades(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
             base_amount = cost / price if price else None
         if base_amount is None:
             continue
-        quote_amount = (price * base_amount) if (price and base_amount) else cost or Decimal("0")
-        side = "BUY" if (row.get("Order Type") or "").lower() == "bid" else "SELL"
+        quote_amount = (price * base_amount) if (price and base_amount) else cost or ZERO
+        side = "BUY" if normalize_lower(get("Order Type")) == "bid" else "SELL"
         mapped.append({
             "Id": f"firi-trade-{trade_id}",
             "ExchangeId": trade_id,
-            "timeStamp": parse_firi_timestamp(row.get("Executed", "")),
+            "timeStamp": parse_firi_timestamp(get("Executed", "")),
             "Status": "COMPLETED",
             "Market": format_market(base, quote),
             "Exchange": "FIRI",
@@ -213,29 +264,32 @@ def _map_trades(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
             "Fee": "",
             "FeeCurrency": "",
         })
-    mapped.sort(key=lambda item: item.get("timeStamp", ""))
+    mapped.sort(key=itemgetter("timeStamp"))
     return mapped
 
 
 def _map_orders(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
     mapped: List[Dict[str, str]] = []
+    # Bind hot helpers to locals once for the per-row loop
+    parse = parse_decimal
     for row in rows:
-        order_id = row.get("Order ID")
+        get = row.get
+        order_id = get("Order ID")
         if not order_id:
             continue
-        market_symbol = (row.get("Market") or "").upper()
+        market_symbol = normalize_upper(get("Market"))
         base_market, quote_market = split_market(market_symbol)
-        filled = parse_decimal(row.get("Filled")) or Decimal("0")
-        price = parse_decimal(row.get("Price"))
-        base_currency = (row.get("Filled currency") or base_market or "").upper()
+        filled = parse(get("Filled")) or ZERO
+        price = parse(get("Price"))
+        base_currency = (get("Filled currency") or base_market or "").upper()
         quote_currency = quote_market
         filled_quote = (price * filled) if (price and filled) else None
-        side = "BUY" if (row.get("Order Type") or "").lower() == "bid" else "SELL"
-        status = (row.get("Status") or "").upper()
+        side = "BUY" if normalize_lower(get("Order Type")) == "bid" else "SELL"
+        status = normalize_upper(get("Status"))
         mapped.append({
             "Id": f"firi-order-{order_id}",
             "ExchangeId": order_id,
-            "timeStamp": parse_firi_timestamp(row.get("Created at", "")),
+            "timeStamp": parse_firi_timestamp(get("Created at", "")),
             "Status": status,
             "Market": format_market(base_currency, quote_currency),
             "Exchange": "FIRI",
@@ -247,14 +301,10 @@ def _map_orders(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
             "Fee": "",
             "FeeCurrency": "",
         })
-    mapped.sort(key=lambda item: item.get("timeStamp", ""))
+    mapped.sort(key=itemgetter("timeStamp"))
     return mapped
 
 
-def _ensure_columns(row: Dict[str, Any]) -> Dict[str, Any]:
-    return {column: row.get(column, "") for column in OUTPUT_HEADERS}
-
-
 def map_firi_file(_file_path: Path, rows: List[Dict[str, str]], _context: Dict[str, Any]) -> List[Dict[str, Any]]:
     if not rows:
         return []
@@ -267,7 +317,8 @@ def map_firi_file(_file_path: Path, rows: List[Dict[str, str]], _context: Dict[s
         mapped_rows = _map_orders(rows)
     else:
         mapped_rows = []
-    return [_ensure_columns(row) for row in mapped_rows]
+    # Each mapper builds complete rows in OUTPUT_HEADERS order already
+    return mapped_rows
 
 
 def map_firi_transactions(
@@ -277,4 +328,4 @@ def map_firi_transactions(
 
     if not rows:
         return []
-    return [_ensure_columns(row) for row in _map_transactions(rows)]
+    return _map_transactions(rows)
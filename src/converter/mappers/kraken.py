@@ -3,22 +3,27 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
-from ..constants import OUTPUT_HEADERS
 from ..utils import (
+    ZERO,
     abs_decimal_to_str,
     decimal_to_str,
     format_market,
     is_fiat,
+    normalize_lower,
+    normalize_upper,
     parse_decimal,
     parse_kraken_timestamp,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class KrakenLedgerRow:
+    """One ledger entry; ``time`` is kept raw and only parsed for output rows."""
+
     txid: str
     refid: str
     time: str
@@ -30,22 +35,23 @@ class KrakenLedgerRow:
 
 
 def _normalize_row(raw: Dict[str, str]) -> KrakenLedgerRow:
+    get = raw.get
     return KrakenLedgerRow(
-        txid=(raw.get("txid") or "").strip(),
-        refid=(raw.get("refid") or "").strip(),
-        time=parse_kraken_timestamp(raw.get("time") or ""),
-        event_type=(raw.get("type") or "").strip().lower(),
-        subtype=(raw.get("subtype") or "").strip().lower(),
-        asset=(raw.get("asset") or "").strip().upper(),
-        amount=parse_decimal(raw.get("amount")) or Decimal("0"),
-        fee=parse_decimal(raw.get("fee")) or Decimal("0"),
+        txid=(get("txid") or "").strip(),
+        refid=(get("refid") or "").strip(),
+        time=(get("time") or "").strip(),
+        event_type=normalize_lower(get("type")),
+        subtype=normalize_lower(get("subtype")),
+        asset=normalize_upper(get("asset")),
+        amount=parse_decimal(get("amount")) or ZERO,
+        fee=parse_decimal(get("fee")) or ZERO,
     )
 
 
-def _group_by_refid(rows: Iterable[KrakenLedgerRow]) -> Dict[str, List[KrakenLedgerRow]]:
-    grouped: Dict[str, List[KrakenLedgerRow]] = defaultdict(list)
+def _group_by_refid(rows: Iterable[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+    grouped: Dict[str, List[Dict[str, str]]] = defaultdict(list)
     for row in rows:
-        key = row.refid or row.txid
+        key = (row.get("refid") or "").strip() or (row.get("txid") or "").strip()
         grouped[key].append(row)
     return grouped
 
@@ -58,7 +64,7 @@ def _map_reward(rows: List[KrakenLedgerRow]) -> Optional[Dict[str, Any]]:
     return {
         "Id": identifier,
         "ExchangeId": identifier,
-        "timeStamp": reward.time,
+        "timeStamp": parse_kraken_timestamp(reward.time),
         "Status": "COMPLETED",
         "Market": reward.asset,
         "Exchange": "KRAKEN",
@@ -73,15 +79,23 @@ def _map_reward(rows: List[KrakenLedgerRow]) -> Optional[Dict[str, Any]]:
 
 
 def _map_trade_group(rows: List[KrakenLedgerRow]) -> Optional[Dict[str, Any]]:
-    positive_rows = [row for row in rows if row.amount > 0]
-    negative_rows = [row for row in rows if row.amount < 0]
-
-    if not positive_rows and not negative_rows:
+    # One pass picks the first receive/spend legs and totals the fees
+    receive: Optional[KrakenLedgerRow] = None
+    spend: Optional[KrakenLedgerRow] = None
+    fee_total = ZERO
+    for row in rows:
+        if row.fee:
+            fee_total += row.fee
+        if row.amount > 0:
+            if receive is None:
+                receive = row
+        elif row.amount < 0:
+            if spend is None:
+                spend = row
+
+    if receive is None and spend is None:
         return None
 
-    receive = positive_rows[0] if positive_rows else None
-    spend = negative_rows[0] if negative_rows else None
-
     base_row: Optional[KrakenLedgerRow]
     quote_row: Optional[KrakenLedgerRow]
     side = "BUY"
@@ -129,13 +143,12 @@ def _map_trade_group(rows: List[KrakenLedgerRow]) -> Optional[Dict[str, Any]]:
         except (ArithmeticError, ZeroDivisionError):  # pragma: no cover - defensive
             price = None
 
-    fee_total = sum((row.fee for row in rows), Decimal("0"))
     fee_currency = quote_currency or base_currency if fee_total else ""
 
     return {
         "Id": identifier,
         "ExchangeId": identifier,
-        "timeStamp": timestamp,
+        "timeStamp": parse_kraken_timestamp(timestamp),
         "Status": "COMPLETED",
         "Market": format_market(base_currency, quote_currency),
         "Exchange": "KRAKEN",
@@ -155,22 +168,24 @@ def map_kraken_ledger(
     if not rows:
         return []
 
-    normalized = [_normalize_row(row) for row in rows if row.get("txid")]
-    grouped = _group_by_refid(normalized)
+    # Group the raw rows first so Decimal and timestamp parsing only runs for
+    # ledger entries that are actually mapped (deposits etc. are dropped)
+    grouped = _group_by_refid(row for row in rows if row.get("txid"))
 
+    normalize = _normalize_row
     mapped: List[Dict[str, Any]] = []
     for group in grouped.values():
         if not group:
             continue
-        event_type = group[0].event_type
+        event_type = normalize_lower(group[0].get("type"))
         if event_type == "reward":
-            mapped_row = _map_reward(group)
+            mapped_row = _map_reward([normalize(group[0])])
         elif event_type in {"trade", "spend", "receive"}:
-            mapped_row = _map_trade_group(group)
+            mapped_row = _map_trade_group([normalize(row) for row in group])
         else:
             mapped_row = None
         if mapped_row:
-            mapped.append({key: mapped_row.get(key, "") for key in OUTPUT_HEADERS})
+            mapped.append(mapped_row)
 
-    mapped.sort(key=lambda row: row.get("timeStamp", ""))
+    mapped.sort(key=itemgetter("timeStamp"))
     return mapped
\ No newline at end of file
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from ..utils import format_market, is_fiat, parse_decimal
+from ..constants import IO_BUFFER_SIZE
+from ..utils import (
+    ZERO,
+    advise_sequential_read,
+    format_market,
+    is_fiat,
+    normalize_upper,
+    parse_decimal,
+)
 
 
-@dataclass
-class NbxTradeBreakdown:
+class NbxTradeBreakdown(NamedTuple):
     side: str
     base_amount: Decimal
     base_currency: str
@@ -20,29 +26,56 @@ class NbxTradeBreakdown:
     market: str
 
 
-def load_nbx_rows(file_path: Path) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
-    """Read NBX annual report exports which use semicolon delimiters."""
+# Every character str.strip() treats as whitespace (NBSP, \f, \v, ...; the
+# highest is U+3000) plus stray quotes, so NBX cells are trimmed in one pass
+_CELL_STRIP = "".join(chr(code) for code in range(0x3001) if chr(code).isspace()) + '"'
 
-    with file_path.open("r", encoding="utf-8-sig", newline="") as handle:
+# (in is fiat, out is fiat) -> (side, base is the "In" leg); mixed pairs only
+_SIDE_TABLE: Dict[Tuple[bool, bool], Tuple[str, bool]] = {
+    (True, False): ("SELL", False),
+    (False, True): ("BUY", True),
+}
+
+
+def load_nbx_rows(file_path: Path) -> Tuple[Iterator[Dict[str, str]], Dict[str, Any]]:
+    """Read NBX annual report exports which use semicolon delimiters.
+
+    The header is read eagerly; data rows are then streamed from the same
+    handle, which is closed once they are exhausted.
+    """
+
+    handle = file_path.open("r", encoding="utf-8", newline="", buffering=IO_BUFFER_SIZE)
+    try:
+        advise_sequential_read(handle)
         reader = csv.reader(handle, delimiter=";")
         header = next(reader, None)
-        if not header:
-            return [], {}
-        header = [col.strip().strip('"') for col in header]
-        rows: List[Dict[str, str]] = []
+    except BaseException:
+        handle.close()
+        raise
+    if not header:
+        handle.close()
+        return iter(()), {}
+    # Plain utf-8 decodes faster than utf-8-sig; drop the BOM by hand
+    if header[0].startswith("\ufeff"):
+        header[0] = header[0][1:]
+    header = [col.strip(_CELL_STRIP) for col in header]
+    # Resolve the named column positions once; only those cells are cleaned
+    columns = [(idx, name) for idx, name in enumerate(header) if name]
+    return _iter_nbx_rows(handle, reader, columns), {}
+
+
+def _iter_nbx_rows(
+    handle: IO[str], reader: Iterator[List[str]], columns: List[Tuple[int, str]]
+) -> Iterator[Dict[str, str]]:
+    with handle:
         for raw in reader:
             if not any(raw):
                 continue
-            normalized = [value.strip().strip('"') for value in raw]
-            while len(normalized) < len(header):
-                normalized.append("")
-            row = {
-                header[idx]: normalized[idx]
-                for idx in range(len(header))
-                if header[idx]
+            width = len(raw)
+            yield {
+                name: raw[idx].strip(_CELL_STRIP) if idx < width else ""
+                for idx, name in columns
             }
-            rows.append(row)
-        return rows, {}
 
 
 def nbx_trade_breakdown(row: Dict[str, str]) -> Optional[NbxTradeBreakdown]:
@@ -50,23 +83,20 @@ def nbx_trade_breakdown(row: Dict[str, str]) -> Optional[NbxTradeBreakdown]:
     if tx_type != "Trade":
         return None
 
-    amount_in = parse_decimal(row.get("In")) or Decimal("0")
-    currency_in = (row.get("In-Currency") or "").upper()
-    amount_out = parse_decimal(row.get("Out")) or Decimal("0")
-    currency_out = (row.get("Out-Currency") or "").upper()
-
-    if is_fiat(currency_in) and not is_fiat(currency_out):
-        side = "SELL"
-        base_amount = amount_out
-        base_currency = currency_out
-        quote_amount = amount_in
-        quote_currency = currency_in
-    elif not is_fiat(currency_in) and is_fiat(currency_out):
-        side = "BUY"
-        base_amount = amount_in
-        base_currency = currency_in
-        quote_amount = amount_out
-        quote_currency = currency_out
+    amount_in = parse_decimal(row.get("In")) or ZERO
+    currency_in = normalize_upper(row.get("In-Currency"))
+    amount_out = parse_decimal(row.get("Out")) or ZERO
+    currency_out = normalize_upper(row.get("Out-Currency"))
+
+    entry = _SIDE_TABLE.get((is_fiat(currency_in), is_fiat(currency_out)))
+    if entry is not None:
+        side, base_is_in = entry
+        if base_is_in:
+            base_amount, base_currency = amount_in, currency_in
+            quote_amount, quote_currency = amount_out, currency_out
+        else:
+            base_amount, base_currency = amount_out, currency_out
+            quote_amount, quote_currency = amount_in, currency_in
     else:
         side = "BUY"
         base_amount = amount_in or amount_out
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, cast
+from functools import lru_cache
+import keyword
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 from .constants import OUTPUT_HEADERS
 from .utils import (
@@ -55,7 +58,29 @@ _BASE_ENV: Dict[str, Any] = {
 }
 
 
+def _normalize_float(value: float) -> str:
+    # Whole floats below 1e16 print exactly as ints; skip the Decimal round-trip
+    if value.is_integer() and 1 <= abs(value) < 1e16:
+        return str(int(value))
+    return decimal_to_str(Decimal(str(value)))
+
+
+_NORMALIZERS: Dict[type, Callable[[Any], str]] = {
+    str: str.strip,
+    type(None): lambda value: "",
+    bool: lambda value: "true" if value else "false",
+    Decimal: decimal_to_str,
+    int: str,
+    float: _normalize_float,
+}
+
+
 def _normalize_output_value(value: Any) -> str:
+    # Exact-type dispatch covers nearly every value; subclasses and
+    # containers fall through to the isinstance checks below.
+    handler = _NORMALIZERS.get(type(value))
+    if handler is not None:
+        return handler(value)
     if value is None:
         return ""
     if isinstance(value, bool):
@@ -79,59 +104,160 @@ def _normalize_output_value(value: Any) -> str:
     return str(value)
 
 
-def _evaluate_expression(
-    expression: str,
-    env: Dict[str, Any],
-    label: str,
-    row_index: Optional[int],
-) -> Any:
+RowMapper = Callable[[Dict[str, Any], Dict[str, Any]], Optional[Dict[str, str]]]
+
+# Names the generated mapper uses itself; precompute entries may not reuse them
+_INTERNAL_NAMES = ("_Exception", "_MappingConfigurationError", "_normalize", "_mapping_error")
+_COLUMN_VAR = re.compile(r"_c\d+")
+
+_Items = Tuple[Tuple[str, Any], ...]
+# (precompute, skip_when, mapping, typed defaults) as hashable tuples
+MapperKey = Tuple[_Items, Tuple[Any, ...], _Items, Tuple[Tuple[str, type, Any], ...]]
+
+
+def _check_expression(expression: Any, label: str) -> str:
+    if not isinstance(expression, str):
+        raise MappingConfigurationError(
+            f"Expression for {label} must be a string; received {type(expression).__name__}"
+        )
+    # compile() rather than ast.parse() so yield/await are rejected here
+    # instead of changing the shape of the generated mapper
     try:
-        return eval(expression, _SAFE_GLOBALS, env)
-    except Exception as exc:  # pragma: no cover - defensive
-        location = f"row {row_index}" if row_index is not None else "row"
+        compile(expression, f"<mapping:{label}>", "eval")
+    except SyntaxError as exc:
         raise MappingConfigurationError(
-            f"Error evaluating expression '{expression}' for {label} ({location}): {exc}"
+            f"Invalid expression '{expression}' for {label}: {exc}"
         ) from exc
+    return expression
 
 
-def _build_environment(row: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-    env = dict(_BASE_ENV)
-    env["row"] = row
-    env["context"] = context
-    env["config"] = context.get("config")
-    if "row_index" in context:
-        env["row_index"] = context["row_index"]
-        env["row_number"] = context["row_index"]
-    return env
+def _build_row_mapper(file_config: Dict[str, Any]) -> RowMapper:
+    precompute = cast(Dict[str, str], file_config.get("precompute") or {})
+    skip_when = cast(List[str], file_config.get("skip_when") or [])
+    mapping = cast(Dict[str, str], file_config.get("mapping") or {})
+    defaults = cast(Dict[str, Any], file_config.get("defaults") or {})
 
+    expressions: List[Tuple[str, str]] = []
+    # Helpers are bound as keyword-only defaults so expressions load them as
+    # fast locals rather than through global dict lookups.
+    bound = [*_BASE_ENV, *_INTERNAL_NAMES]
+    helpers = ", ".join(f"{name}={name}" for name in bound)
+    lines = [
+        f"def _row_mapper(row, context, *, {helpers}):",
+        "    config = context.get('config')",
+        "    row_index = context.get('row_index')",
+        "    row_number = row_index",
+    ]
 
-def apply_row_mapping(
-    row: Dict[str, Any],
-    file_config: Dict[str, Any],
-    context: Dict[str, Any],
-) -> Optional[Dict[str, str]]:
-    env = _build_environment(row, context)
-    row_index = context.get("row_index")
+    def emit(statement: str, expression: str, label: str) -> None:
+        # Each expression gets its own guard so errors name the failing entry
+        index = len(expressions)
+        expressions.append((expression, label))
+        lines.append("    try:")
+        lines.append(statement.format(expr=f"(\n{expression}\n)"))
+        lines.append("    except _MappingConfigurationError:")
+        lines.append("        raise")
+        lines.append("    except _Exception as exc:")
+        lines.append(f"        raise _mapping_error({index}, row_index, exc) from exc")
 
-    precompute = cast(Dict[str, str], file_config.get("precompute") or {})
     for name, expr in precompute.items():
-        env[name] = _evaluate_expression(expr, env, f"precompute:{name}", row_index)
+        label = f"precompute:{name}"
+        # Names may shadow helpers, just as they overrode the eval environment,
+        # but not the generated mapper's own internals
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise MappingConfigurationError(
+                f"Invalid precompute name '{name}'; use a Python identifier"
+            )
+        if name in _INTERNAL_NAMES or _COLUMN_VAR.fullmatch(name):
+            raise MappingConfigurationError(
+                f"Invalid precompute name '{name}'; it is reserved by the row mapper"
+            )
+        emit(f"        {name} = {{expr}}", _check_expression(expr, label), label)
 
-    skip_when = cast(List[str], file_config.get("skip_when") or [])
     for predicate in skip_when:
-        if _evaluate_expression(predicate, env, "skip_when", row_index):
-            return None
-
-    mapping = cast(Dict[str, str], file_config.get("mapping") or {})
-    defaults = cast(Dict[str, Any], file_config.get("defaults") or {})
+        emit(
+            "        if {expr}:\n            return None",
+            _check_expression(predicate, "skip_when"),
+            "skip_when",
+        )
 
-    result: Dict[str, str] = {}
-    for column in OUTPUT_HEADERS:
+    fields: List[str] = []
+    for position, column in enumerate(OUTPUT_HEADERS):
         if column in mapping:
-            value = _evaluate_expression(
-                mapping[column], env, f"column:{column}", row_index
+            label = f"column:{column}"
+            emit(
+                f"        _c{position} = _normalize({{expr}})",
+                _check_expression(mapping[column], label),
+                label,
             )
+            fields.append(f"{column!r}: _c{position}")
         else:
-            value = defaults.get(column, "")
-        result[column] = _normalize_output_value(value)
-    return result
+            default = _normalize_output_value(defaults.get(column, ""))
+            fields.append(f"{column!r}: {default!r}")
+    lines.append("    return {" + ", ".join(fields) + "}")
+
+    def mapping_error(index: int, row_index: Optional[int], exc: Exception) -> Exception:
+        expression, label = expressions[index]
+        location = f"row {row_index}" if row_index is not None else "row"
+        return MappingConfigurationError(
+            f"Error evaluating expression '{expression}' for {label} ({location}): {exc}"
+        )
+
+    namespace: Dict[str, Any] = dict(_BASE_ENV)
+    namespace.update(_SAFE_GLOBALS)
+    namespace["_Exception"] = Exception
+    namespace["_MappingConfigurationError"] = MappingConfigurationError
+    namespace["_normalize"] = _normalize_output_value
+    namespace["_mapping_error"] = mapping_error
+    try:
+        code = compile("\n".join(lines), "<mapping>", "exec")
+    except SyntaxError as exc:
+        raise MappingConfigurationError(f"Could not build row mapper: {exc}") from exc
+    exec(code, namespace)
+    return cast(RowMapper, namespace["_row_mapper"])
+
+
+def compile_row_mapper(file_config: Dict[str, Any]) -> RowMapper:
+    """Return a function mapping one row according to ``file_config``.
+
+    The precompute, skip_when and mapping expressions are generated into a
+    single Python function once per config, so rows run straight-line
+    bytecode instead of re-interpreting the config for every row.
+    """
+    # Keyed by the mapping content rather than the dict itself, so equal
+    # configs share a mapper and no config is kept alive by the cache
+    key: MapperKey = (
+        tuple((file_config.get("precompute") or {}).items()),
+        tuple(file_config.get("skip_when") or ()),
+        tuple((file_config.get("mapping") or {}).items()),
+        # Types are part of the key: 1 == True but they render differently
+        tuple(
+            (column, type(value), value)
+            for column, value in (file_config.get("defaults") or {}).items()
+        ),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable values (e.g. list defaults) skip the cache
+        return _build_row_mapper(file_config)
+    return _cached_row_mapper(key)
+
+
+@lru_cache(maxsize=64)
+def _cached_row_mapper(key: MapperKey) -> RowMapper:
+    precompute, skip_when, mapping, defaults = key
+    return _build_row_mapper({
+        "precompute": dict(precompute),
+        "skip_when": list(skip_when),
+        "mapping": dict(mapping),
+        "defaults": {column: value for column, _, value in defaults},
+    })
+
+
+def apply_row_mapping(
+    row: Dict[str, Any],
+    file_config: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Optional[Dict[str, str]]:
+    return compile_row_mapper(file_config)(row, context)
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+import os
 import re
-from typing import Optional, Tuple
+from typing import IO, Optional, Tuple
 
 from .constants import FIAT_CURRENCIES
 
 _DECIMAL_CLEANER = re.compile(r"[^0-9,\-.]")
+# str.translate equivalent of _DECIMAL_CLEANER for the common ASCII-only case
+_DECIMAL_ASCII_DELETE = str.maketrans(
+    "", "", "".join(chr(i) for i in range(128) if chr(i) not in "0123456789,-.")
+)
+# Values made only of these characters need no cleaning or separator handling
+_PLAIN_NUMBER_CHARS = "0123456789.-"
+
+# Known quote currencies grouped by length, longest first, so split_market
+# can test each group with a single str.endswith call
+_QUOTE_CANDIDATES = FIAT_CURRENCIES | {"USDC", "USDT", "BTC", "ETH"}
+_QUOTE_SUFFIXES_BY_LENGTH: Tuple[Tuple[int, Tuple[str, ...]], ...] = tuple(
+    (length, tuple(sorted(q for q in _QUOTE_CANDIDATES if len(q) == length)))
+    for length in sorted({len(q) for q in _QUOTE_CANDIDATES}, reverse=True)
+)
+
+# Exact shapes of the Kraken and Firi timestamps; matching ones are built into
+# a datetime directly and anything else falls back to strptime.
+_KRAKEN_TIMESTAMP = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?", re.ASCII
+)
+_FIRI_TIMESTAMP = re.compile(
+    r"(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) ([A-Za-z]{3}) (\d{2}) (\d{4}) "
+    r"(\d{2}):(\d{2}):(\d{2}) GMT([+-])(\d{2})(\d{2}) \(Coordinated Universal Time\)",
+    re.ASCII | re.IGNORECASE,
+)
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+# Shared zero so hot paths don't construct Decimal("0") from a string each time
+ZERO = Decimal("0")
 
 
 def parse_decimal(value: Optional[str]) -> Optional[Decimal]:
@@ -16,7 +53,24 @@ def parse_decimal(value: Optional[str]) -> Optional[Decimal]:
     cleaned = value.strip()
     if not cleaned:
         return None
-    cleaned = _DECIMAL_CLEANER.sub("", cleaned)
+    return _parse_decimal(cleaned)
+
+
+# Amounts, fees and zero balances repeat heavily across rows; Decimal is
+# immutable so cached instances are safe to share.
+@lru_cache(maxsize=16384)
+def _parse_decimal(cleaned: str) -> Optional[Decimal]:
+    if not cleaned.strip(_PLAIN_NUMBER_CHARS):
+        if cleaned in {"-", "-.", "."}:
+            return None
+        try:
+            return Decimal(cleaned)
+        except InvalidOperation:
+            return None
+    if cleaned.isascii():
+        cleaned = cleaned.translate(_DECIMAL_ASCII_DELETE)
+    else:
+        cleaned = _DECIMAL_CLEANER.sub("", cleaned)
     if not cleaned or cleaned in {"-", "-.", "."}:
         return None
     # remove thousands separators
@@ -33,6 +87,19 @@ def parse_decimal(value: Optional[str]) -> Optional[Decimal]:
 def decimal_to_str(value: Optional[Decimal]) -> str:
     if value is None:
         return ""
+    if isinstance(value, Decimal) and value.is_finite():
+        # Equal finite values of the same sign always render identically, so
+        # the sign joins the cache key to keep "-0" apart from "0"
+        return _finite_decimal_to_str(value, value.is_signed())
+    return _format_decimal(value)
+
+
+@lru_cache(maxsize=4096)
+def _finite_decimal_to_str(value: Decimal, _signed: bool) -> str:
+    return _format_decimal(value)
+
+
+def _format_decimal(value: Decimal) -> str:
     text = format(value, "f")
     if "." in text:
         text = text.rstrip("0").rstrip(".")
@@ -45,17 +112,27 @@ def abs_decimal_to_str(value: Optional[Decimal]) -> str:
     return decimal_to_str(abs(value))
 
 
+def _fromisoformat(raw: str) -> datetime:
+    # fromisoformat only accepts a trailing "Z" from Python 3.11 onwards
+    if raw.endswith("Z"):
+        raw = raw[:-1] + "+00:00"
+    return datetime.fromisoformat(raw)
+
+
 def parse_coinbase_timestamp(raw: str) -> str:
     raw = (raw or "").strip()
-    if not raw:
-        return ""
+    return _parse_coinbase_timestamp(raw) if raw else ""
+
+
+@lru_cache(maxsize=8192)
+def _parse_coinbase_timestamp(raw: str) -> str:
     try:
         dt = datetime.strptime(raw, "%Y-%m-%d %H:%M:%S %Z")
         return dt.replace(tzinfo=timezone.utc).isoformat()
     except ValueError:
         pass
     try:
-        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        dt = _fromisoformat(raw)
         return dt.isoformat()
     except ValueError:
         return raw
@@ -63,18 +140,38 @@ def parse_coinbase_timestamp(raw: str) -> str:
 
 def parse_iso_timestamp(raw: str) -> str:
     raw = (raw or "").strip()
-    if not raw:
-        return ""
+    return _parse_iso_timestamp(raw) if raw else ""
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_timestamp(raw: str) -> str:
     try:
-        return datetime.fromisoformat(raw.replace("Z", "+00:00")).isoformat()
+        return _fromisoformat(raw).isoformat()
     except ValueError:
         return raw
 
 
 def parse_firi_timestamp(raw: str) -> str:
     raw = (raw or "").strip()
-    if not raw:
-        return ""
+    return _parse_firi_timestamp(raw) if raw else ""
+
+
+@lru_cache(maxsize=8192)
+def _parse_firi_timestamp(raw: str) -> str:
+    match = _FIRI_TIMESTAMP.fullmatch(raw)
+    if match:
+        month_name, day, year, hour, minute, second, sign, off_h, off_m = match.groups()
+        month = _MONTHS.get(month_name.lower())
+        if month is not None and int(off_m) < 60:
+            offset = timedelta(hours=int(off_h), minutes=int(off_m))
+            try:
+                dt = datetime(
+                    int(year), month, int(day), int(hour), int(minute), int(second),
+                    tzinfo=timezone(-offset if sign == "-" else offset),
+                )
+                return dt.astimezone(timezone.utc).isoformat()
+            except ValueError:
+                pass
     patterns = [
         "%a %b %d %Y %H:%M:%S GMT%z (Coordinated Universal Time)",
         "%a %b %d %Y %H:%M:%S %Z",
@@ -86,15 +183,30 @@ def parse_firi_timestamp(raw: str) -> str:
         except ValueError:
             continue
     try:
-        return datetime.fromisoformat(raw.replace("Z", "+00:00")).isoformat()
+        return _fromisoformat(raw).isoformat()
     except ValueError:
         return raw
 
 
 def parse_kraken_timestamp(raw: str) -> str:
     raw = (raw or "").strip()
-    if not raw:
-        return ""
+    return _parse_kraken_timestamp(raw) if raw else ""
+
+
+@lru_cache(maxsize=8192)
+def _parse_kraken_timestamp(raw: str) -> str:
+    match = _KRAKEN_TIMESTAMP.fullmatch(raw)
+    if match:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        try:
+            dt = datetime(
+                int(year), int(month), int(day), int(hour), int(minute), int(second),
+                int(fraction.ljust(6, "0")) if fraction else 0,
+                tzinfo=timezone.utc,
+            )
+            return dt.isoformat()
+        except ValueError:
+            pass
     formats = [
         "%Y-%m-%d %H:%M:%S.%f",
         "%Y-%m-%d %H:%M:%S",
@@ -108,6 +220,7 @@ def parse_kraken_timestamp(raw: str) -> str:
     return raw
 
 
+@lru_cache(maxsize=1024)
 def format_market(base: str, quote: Optional[str]) -> str:
     base_clean = (base or "").strip().upper()
     quote_clean = (quote or "").strip().upper()
@@ -118,18 +231,43 @@ def format_market(base: str, quote: Optional[str]) -> str:
     return f"{base_clean}-{quote_clean}"
 
 
+@lru_cache(maxsize=1024)
 def split_market(symbol: str) -> Tuple[str, Optional[str]]:
     cleaned = (symbol or "").strip().upper()
     if not cleaned:
         return "", None
-    candidates = sorted(FIAT_CURRENCIES | {"USDC", "USDT", "BTC", "ETH"}, key=len, reverse=True)
-    for quote in candidates:
-        if cleaned.endswith(quote) and cleaned != quote:
-            return cleaned[:-len(quote)], quote
+    for length, suffixes in _QUOTE_SUFFIXES_BY_LENGTH:
+        if len(cleaned) > length and cleaned.endswith(suffixes):
+            return cleaned[:-length], cleaned[-length:]
     if len(cleaned) > 3:
         return cleaned[:-3], cleaned[-3:]
     return cleaned, None
 
 
+def normalize_upper(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    # Exported codes are usually already clean uppercase ASCII
+    if value.isascii() and value.isupper() and not (value[0].isspace() or value[-1].isspace()):
+        return value
+    return value.strip().upper()
+
+
+def normalize_lower(value: Optional[str]) -> str:
+    return value.strip().lower() if value else ""
+
+
+@lru_cache(maxsize=256)
 def is_fiat(currency: Optional[str]) -> bool:
-    return (currency or "").strip().upper() in FIAT_CURRENCIES
+    return normalize_upper(currency) in FIAT_CURRENCIES
+
+
+def advise_sequential_read(handle: IO) -> None:
+    """Hint the kernel that ``handle`` will be read front to back."""
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    try:
+        fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass